@@ -3,12 +3,22 @@
 Handles authentication, session management, and low-level HTTP requests.
 """
 
+import http.cookiejar
+import json
 import os
 import platform
 import re
+import threading
 from typing import Optional, Dict, Any, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 from ..version import VERSION
 from ..logging import get_logger
@@ -30,17 +40,159 @@ from ..error import (
 )
 
 
+# Statuses that are safe to retry for any method: the server did not process the request
+_RETRY_STATUSES = (429, 503)
+# Gateway errors: the upstream may still have completed (and billed) the request,
+# so only idempotent GETs are retried
+_GET_ONLY_RETRY_STATUSES = (502, 504)
+_DEFAULT_MAX_RETRIES = 3
+# Upper bound in seconds on a server-supplied Retry-After wait, which is slept
+# outside the request timeout
+_MAX_RETRY_AFTER = 10.0
+# Random extra seconds (up to this much) added to each backoff sleep
+_BACKOFF_JITTER = 1.0
+# Keep-alive connections kept per host; beyond this, concurrent requests open
+# connections that are discarded afterwards
+_DEFAULT_POOL_MAXSIZE = 100
+
+
+# Common patterns for model names in error messages, compiled once
+_MODEL_NAME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"model\s+['\"]([^'\"]+)['\"]",  # model "name" or model 'name'
+    r"['\"]([^'\"]*(?:preview|raw|nsfw|helvete|dhanishtha)[^'\"]*)['\"]",  # quoted model names with keywords
+    r"Model\s+([^\s]+)\s+(?:not found|unavailable|invalid)",  # Model xyz not found
+    r"Invalid model:\s*([^\s,]+)",  # Invalid model: xyz
+    r"model_id['\"]?\s*:\s*['\"]([^'\"]+)['\"]",  # model_id: "name"
+))
+
+# Error substrings that suggest retrying with stream=True, as one alternation
+_STREAMING_HINT_RE = re.compile(
+    "|".join(re.escape(indicator) for indicator in (
+        "stream",
+        "tool_call",
+        "function_call",
+        "tools",
+        "functions",
+        "timeout",
+        "too large",
+        "response size",
+        "buffer",
+        "partial",
+        "chunk",
+        "incomplete",
+        "connection",
+        "network",
+        "502",
+        "503",
+        "504",
+    )),
+    re.IGNORECASE,
+)
+
+class _Retry(Retry):
+    """Retry policy that never replays a POST on a gateway error and caps Retry-After."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code in _GET_ONLY_RETRY_STATUSES and method.upper() != "GET":
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, _MAX_RETRY_AFTER)
+
+
+def _build_adapter(max_retries: int, pool_maxsize: int = _DEFAULT_POOL_MAXSIZE) -> HTTPAdapter:
+    """Build an HTTP adapter with a shared connection pool and retry policy."""
+    retry_options = dict(
+        total=max_retries,
+        read=False,  # never replay a POST whose response was partially read
+        backoff_factor=1.0,
+        status_forcelist=_RETRY_STATUSES + _GET_ONLY_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # let _request map the final status to an HAIError
+    )
+    try:
+        # Jitter spreads out retries from many clients; urllib3 < 2 has no support for it
+        retry = _Retry(backoff_jitter=_BACKOFF_JITTER, **retry_options)
+    except TypeError:
+        retry = _Retry(**retry_options)
+    return HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry)
+
+
+def _new_session(max_retries: int, pool_maxsize: int = _DEFAULT_POOL_MAXSIZE) -> requests.Session:
+    """Create a session with the pooled adapter mounted and static headers set."""
+    session = requests.Session()
+    adapter = _build_adapter(max_retries, pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = f"HelpingAI-python/{VERSION}"
+    return session
+
+
+# Process-wide session shared by clients using the default retry and pool settings, so
+# short-lived clients reuse warm keep-alive connections
+_DEFAULT_SESSION: Optional[requests.Session] = None
+_DEFAULT_SESSION_LOCK = threading.Lock()
+
+
+def _get_default_session() -> requests.Session:
+    """Get or lazily create the shared default session."""
+    global _DEFAULT_SESSION
+    if _DEFAULT_SESSION is None:
+        with _DEFAULT_SESSION_LOCK:
+            if _DEFAULT_SESSION is None:
+                session = _new_session(_DEFAULT_MAX_RETRIES)
+                # Clients with different API keys share this session, so never store
+                # or replay server cookies across them
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                _DEFAULT_SESSION = session
+    return _DEFAULT_SESSION
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize a request body to JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # orjson is stricter (e.g. non-str keys); fall back to stdlib
+            pass
+    return json.dumps(data).encode("utf-8")
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON response body, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class BaseClient:
     """Base client with common functionality for the HelpingAI API.
 
     Handles authentication, session management, and low-level HTTP requests.
     """
+
+    # Status codes mapped to exceptions constructed from (status_code, headers)
+    _STATUS_EXCEPTIONS: Dict[int, type] = {
+        401: InvalidAPIKeyError,
+        429: TooManyRequestsError,
+        503: ServiceUnavailableError,
+    }
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         organization: Optional[str] = None,
         base_url: Optional[str] = None,
         timeout: float = 60.0,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        session: Optional[requests.Session] = None,
+        pool_maxsize: int = _DEFAULT_POOL_MAXSIZE,
     ) -> None:
         self.api_key: str = api_key or os.getenv("HAI_API_KEY")  # type: ignore
         if not self.api_key:
@@ -48,9 +200,21 @@ class BaseClient:
         self.organization: Optional[str] = organization
         self.base_url: str = (base_url or "https://api.helpingai.co/v1").rstrip("/")
         self.timeout: float = timeout
-        self.session: requests.Session = requests.Session()
+        if session is None:
+            if max_retries == _DEFAULT_MAX_RETRIES and pool_maxsize == _DEFAULT_POOL_MAXSIZE:
+                session = _get_default_session()
+            else:
+                session = _new_session(max_retries, pool_maxsize)
+        self.session: requests.Session = session
         self.logger = get_logger(__name__)
 
+        # Credentials are per client, so they are sent per call rather than
+        # stored on a session that may be shared with other clients
+        self._anon_headers: Dict[str, str] = {"Content-Type": "application/json"}
+        if self.organization:
+            self._anon_headers["HAI-Organization"] = self.organization
+        self._auth_headers: Dict[str, str] = {**self._anon_headers, "Authorization": f"Bearer {self.api_key}"}
+
     def _parse_error_response(self, response: requests.Response) -> Tuple[str, Optional[str], Optional[str]]:
         """Parse error response and extract message, type, and code.
         
@@ -60,11 +224,18 @@ class BaseClient:
         Returns:
             Tuple of (error_message, error_type, error_code)
         """
-        try:
-            error_data = response.json()
-        except (ValueError, requests.exceptions.JSONDecodeError):
-            # If we can't parse JSON, try to get meaningful info from response
-            content_preview = response.text[:200] if response.text else "No response content"
+        content = response.content
+        error_data = None
+        if content:
+            try:
+                error_data = _loads(content)
+            except ValueError:
+                # Covers both orjson and stdlib JSONDecodeError
+                pass
+
+        if not isinstance(error_data, dict):
+            # If we can't parse a JSON object, try to get meaningful info from response
+            content_preview = response.text[:200] if content else "No response content"
             return (
                 f"HTTP {response.status_code}: {response.reason}. Response: {content_preview}",
                 None,
@@ -76,15 +247,15 @@ class BaseClient:
         error_type = None
         error_code = None
         
-        if isinstance(error_data.get("error"), dict):
+        err = error_data.get("error")
+        if isinstance(err, dict):
             # Nested format: {"error": {"message": "...", "type": "...", "code": "..."}}
-            error_obj = error_data.get("error", {})
-            error_message = error_obj.get("message", error_message)
-            error_type = error_obj.get("type")
-            error_code = error_obj.get("code")
-        elif isinstance(error_data.get("error"), str):
+            error_message = err.get("message", error_message)
+            error_type = err.get("type")
+            error_code = err.get("code")
+        elif isinstance(err, str):
             # Flat format: {"error": "Request failed with status code 400"}
-            error_message = error_data.get("error", error_message)
+            error_message = err
         else:
             # Alternative formats
             error_message = (
@@ -107,17 +278,8 @@ class BaseClient:
         Returns:
             Model name if found, None otherwise
         """
-        # Common patterns for model names in error messages
-        patterns = [
-            r"model\s+['\"]([^'\"]+)['\"]",  # model "name" or model 'name'
-            r"['\"]([^'\"]*(?:preview|raw|nsfw|helvete|dhanishtha)[^'\"]*)['\"]",  # quoted model names with keywords
-            r"Model\s+([^\s]+)\s+(?:not found|unavailable|invalid)",  # Model xyz not found
-            r"Invalid model:\s*([^\s,]+)",  # Invalid model: xyz
-            r"model_id['\"]?\s*:\s*['\"]([^'\"]+)['\"]",  # model_id: "name"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, error_message, re.IGNORECASE)
+        for pattern in _MODEL_NAME_PATTERNS:
+            match = pattern.search(error_message)
             if match:
                 model_name = match.group(1).strip()
                 if model_name and len(model_name) > 0:
@@ -138,28 +300,7 @@ class BaseClient:
         if stream:  # Already streaming, don't suggest again
             return False
             
-        # Comprehensive streaming indicators
-        streaming_indicators = [
-            "stream",
-            "tool_call",
-            "function_call", 
-            "tools",
-            "functions",
-            "timeout",
-            "too large",
-            "response size",
-            "buffer",
-            "partial",
-            "chunk",
-            "incomplete",
-            "connection",
-            "network",
-            "502",
-            "503",
-            "504"
-        ]
-        
-        return any(indicator in error_message.lower() for indicator in streaming_indicators)
+        return _STREAMING_HINT_RE.search(error_message) is not None
 
     def _enhance_error_message(self, error_message: str, status_code: int, stream: bool, path: str) -> str:
         """Enhance error message with helpful suggestions and context.
@@ -181,11 +322,12 @@ class BaseClient:
             if self._should_suggest_streaming(error_message, stream):
                 suggestions.append("Try setting stream=True in your request")
             
-            if "model" in error_message.lower():
+            message_lower = error_message.lower()
+            if "model" in message_lower:
                 suggestions.append("Verify the model name is correct and available")
                 suggestions.append("Use hai.models.list() to see available models")
             
-            if "token" in error_message.lower() or "length" in error_message.lower():
+            if "token" in message_lower or "length" in message_lower:
                 suggestions.append("Try reducing the input length or using a different model")
             
             if "/chat/completions" in path:
@@ -210,6 +352,63 @@ class BaseClient:
         
         return enhanced_message
 
+    def _raise_for_error(self, response: requests.Response, stream: bool, path: str) -> None:
+        """Raise the HAIError subclass matching a non-200 response.
+
+        Args:
+            response: The HTTP response object
+            stream: Whether streaming was enabled
+            path: API endpoint path
+        Raises:
+            HAIError or its subclasses, always.
+        """
+        # Parse error response using helper method
+        error_message, error_type, error_code = self._parse_error_response(response)
+
+        # Log error details for debugging
+        self.logger.debug(
+            f"API Error - Status: {response.status_code}, Path: {path}, "
+            f"Message: {error_message}, Type: {error_type}, Code: {error_code}"
+        )
+
+        # Statuses whose exception carries no message detail dispatch directly
+        status_code = response.status_code
+        exception_cls = self._STATUS_EXCEPTIONS.get(status_code)
+        if exception_cls is not None:
+            raise exception_cls(status_code, response.headers)
+
+        if status_code == 400:
+            # Bad request errors - check for specific patterns
+            # Handle model-specific errors
+            if "model" in error_message.lower():
+                model_name = self._extract_model_name(error_message)
+                if model_name:
+                    raise InvalidModelError(model_name, status_code, response.headers)
+                else:
+                    # Generic model error without extractable name
+                    raise InvalidModelError("Unknown or invalid model", status_code, response.headers)
+
+            enhanced_message = self._enhance_error_message(error_message, 400, stream, path)
+            raise InvalidRequestError(enhanced_message, status_code=status_code, headers=response.headers)
+
+        elif status_code >= 500:
+            # Server errors
+            enhanced_message = self._enhance_error_message(error_message, status_code, stream, path)
+            raise ServerError(enhanced_message, status_code, response.headers)
+
+        elif status_code == 403:
+            # Forbidden - could be content filter or permission issue
+            if "content_filter" in str(error_type).lower() or "content" in error_message.lower():
+                raise ContentFilterError(error_message, status_code, response.headers)
+            else:
+                enhanced_message = self._enhance_error_message(error_message, 403, stream, path)
+                raise APIError(enhanced_message, error_code, error_type, status_code, response.headers)
+
+        else:
+            # Generic API error for other status codes
+            enhanced_message = self._enhance_error_message(error_message, status_code, stream, path)
+            raise APIError(enhanced_message, error_code, error_type, status_code, response.headers)
+
     def _request(
         self,
         method: str,
@@ -234,17 +433,10 @@ class BaseClient:
         Raises:
             HAIError or its subclasses on error.
         """
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        if auth_required:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        
-        # Only add optional headers if they might be needed
-        # Some APIs are sensitive to extra headers
-        if self.organization:
-            headers["HAI-Organization"] = self.organization
+        headers = self._auth_headers if auth_required else self._anon_headers
+        if stream:
+            # Compressing a token stream saves little and can make proxies buffer events
+            headers = {**headers, "Accept-Encoding": "identity"}
 
         url = f"{self.base_url}{path}"
 
@@ -254,71 +446,15 @@ class BaseClient:
                 url=url,
                 headers=headers,
                 params=params,
-                json=json_data,
+                data=_dumps(json_data) if json_data is not None else None,
                 stream=stream,
                 timeout=self.timeout,
             )
             
             if response.status_code != 200:
-                # Parse error response using helper method
-                error_message, error_type, error_code = self._parse_error_response(response)
-                
-                # Log error details for debugging
-                self.logger.debug(
-                    f"API Error - Status: {response.status_code}, Path: {path}, "
-                    f"Message: {error_message}, Type: {error_type}, Code: {error_code}"
-                )
-                
-                # Handle specific status codes with appropriate exceptions
-                if response.status_code == 401:
-                    # Authentication errors
-                    enhanced_message = self._enhance_error_message(error_message, 401, stream, path)
-                    raise InvalidAPIKeyError(response.status_code, response.headers)
-                
-                elif response.status_code == 400:
-                    # Bad request errors - check for specific patterns
-                    enhanced_message = self._enhance_error_message(error_message, 400, stream, path)
-                    
-                    # Handle model-specific errors
-                    if "model" in error_message.lower():
-                        model_name = self._extract_model_name(error_message)
-                        if model_name:
-                            raise InvalidModelError(model_name, response.status_code, response.headers)
-                        else:
-                            # Generic model error without extractable name
-                            raise InvalidModelError("Unknown or invalid model", response.status_code, response.headers)
-                    
-                    raise InvalidRequestError(enhanced_message, status_code=response.status_code, headers=response.headers)
-                
-                elif response.status_code == 429:
-                    # Rate limiting
-                    enhanced_message = self._enhance_error_message(error_message, 429, stream, path)
-                    raise TooManyRequestsError(response.status_code, response.headers)
-                
-                elif response.status_code == 503:
-                    # Service unavailable
-                    enhanced_message = self._enhance_error_message(error_message, 503, stream, path)
-                    raise ServiceUnavailableError(response.status_code, response.headers)
-                
-                elif response.status_code >= 500:
-                    # Server errors
-                    enhanced_message = self._enhance_error_message(error_message, response.status_code, stream, path)
-                    raise ServerError(enhanced_message, response.status_code, response.headers)
-                
-                elif response.status_code == 403:
-                    # Forbidden - could be content filter or permission issue
-                    if "content_filter" in str(error_type).lower() or "content" in error_message.lower():
-                        raise ContentFilterError(error_message, response.status_code, response.headers)
-                    else:
-                        enhanced_message = self._enhance_error_message(error_message, 403, stream, path)
-                        raise APIError(enhanced_message, error_code, error_type, response.status_code, response.headers)
-                
-                else:
-                    # Generic API error for other status codes
-                    enhanced_message = self._enhance_error_message(error_message, response.status_code, stream, path)
-                    raise APIError(enhanced_message, error_code, error_type, response.status_code, response.headers)
+                self._raise_for_error(response, stream, path)
 
-            return response if stream else response.json()
+            return response if stream else _loads(response.content)
 
         except requests.exceptions.Timeout as e:
             self.logger.warning(f"Request timeout for {method} {path} after {self.timeout}s")
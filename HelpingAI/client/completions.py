@@ -4,9 +4,18 @@ Use this to create chat completions, including streaming and function/tool calli
 """
 
 import json
+import operator
+import warnings
+from dataclasses import is_dataclass
 from typing import Optional, Dict, Any, Union, Iterator, List, cast, TYPE_CHECKING
 
 import requests
+import urllib3
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 from ..error import HAIError
 from ..base_models import (
@@ -22,45 +31,106 @@ from ..base_models import (
     FunctionCall
 )
 
+try:
+    from ..tools.compatibility import ensure_tool_call_format, normalize_tool_choice
+except ImportError:  # tool calling support is optional
+    ensure_tool_call_format = normalize_tool_choice = None
+
 if TYPE_CHECKING:
     from .main import HAI
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Guidance appended to tool conversion warnings, keyed by substrings that must
+# all appear in the error; the first matching entry wins
+_TOOL_ERROR_HINTS = (
+    (("Unknown built-in tool",),
+     "Available built-in tools: code_interpreter, web_search. "
+     "For custom tools, use the standard tool definition format. "),
+    (("Unsupported tool item type",),
+     "Tools must be strings (built-in tool names), dicts (standard tool definition schema), "
+     "or MCP server configs. "),
+    (("Unsupported tools format",),
+     "Supported formats: None, string (category), List[Dict] (standard tool definitions), "
+     "List[str] (built-in tools), or List[Fn]. "),
+    (("Failed to initialize MCP tools", "uvx"),
+     "Install uvx with: pip install uvx. "),
+    (("Failed to initialize MCP tools", "npx"),
+     "Install Node.js and npm to use npx commands. "),
+    (("Failed to initialize MCP tools", "fileno"),
+     "This may be due to a subprocess issue. Check MCP server configuration. "),
+)
+
+# Upper bound on one read from the raw SSE byte stream
+_STREAM_CHUNK_SIZE = 8192
+
+
+def _same_items(items: List[Any], snapshot: tuple) -> bool:
+    """Return True if ``items`` still holds exactly the objects in ``snapshot``."""
+    return len(items) == len(snapshot) and all(map(operator.is_, items, snapshot))
+
+
+def _is_cacheable_tool_item(item: Any) -> bool:
+    """Return True if converting ``item`` cannot go stale while the object stays the same.
+
+    Built-in tool names are immutable and standard tool dicts are passed through
+    as-is; Fn objects and MCP server configs can be edited in place.
+    """
+    if isinstance(item, str):
+        return True
+    return isinstance(item, dict) and "type" in item and "mcpServers" not in item
+
+
+def _json_dumps_str(obj: Any) -> str:
+    """Serialize a tool result to a JSON string, preferring orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
 
 class ChatCompletions:
     """Chat completions API interface for the HelpingAI client.
 
     Use this to create chat completions, including streaming and function/tool calling.
     """
+
     def __init__(self, client: "HAI") -> None:
         self._client: "HAI" = client
 
     def _convert_messages_to_dicts(self, messages: List[Union[Dict[str, Any], BaseModel]]) -> List[Dict[str, Any]]:
         """Convert messages to dictionaries, handling BaseModel objects automatically."""
-        converted_messages = []
-        for message in messages:
-            if hasattr(message, 'to_dict'):
-                # Convert BaseModel objects to dict
-                msg_dict = message.to_dict()
-            elif isinstance(message, dict):
-                # Already a dict, but ensure tool_calls are converted if they're BaseModel objects
-                msg_dict = message.copy()
-                if 'tool_calls' in msg_dict and msg_dict['tool_calls']:
-                    converted_tool_calls = []
-                    for tool_call in msg_dict['tool_calls']:
-                        if hasattr(tool_call, 'to_dict'):
-                            converted_tool_calls.append(tool_call.to_dict())
-                        else:
-                            converted_tool_calls.append(tool_call)
-                    msg_dict['tool_calls'] = converted_tool_calls
-            else:
-                # Fallback: try to convert to dict
-                try:
-                    msg_dict = dict(message)
-                except (TypeError, ValueError):
-                    raise ValueError(f"Message must be a dict or BaseModel object, got {type(message)}")
-            
-            converted_messages.append(msg_dict)
-        return converted_messages
+        convert = self._convert_message_to_dict
+        return [convert(message) for message in messages]
+
+    @staticmethod
+    def _convert_message_to_dict(message: Union[Dict[str, Any], BaseModel]) -> Dict[str, Any]:
+        """Convert a single message to a dictionary."""
+        # Plain dicts are by far the most common input, so skip the hasattr probe for them
+        if type(message) is not dict and hasattr(message, 'to_dict'):
+            # Convert BaseModel objects to dict
+            return message.to_dict()
+
+        if isinstance(message, dict):
+            # Already a dict; it is only copied when tool_calls need converting
+            tool_calls = message.get('tool_calls')
+            if not tool_calls:
+                return message
+            return {
+                **message,
+                'tool_calls': [
+                    tool_call.to_dict() if hasattr(tool_call, 'to_dict') else tool_call
+                    for tool_call in tool_calls
+                ],
+            }
+
+        # Fallback: try to convert to dict
+        try:
+            return dict(message)
+        except (TypeError, ValueError):
+            raise ValueError(f"Message must be a dict or BaseModel object, got {type(message)}")
 
     def create_assistant_message(
         self,
@@ -71,27 +141,29 @@ class ChatCompletions:
         """Create an assistant message with automatic tool call conversion.
         
         This helper method makes it easy to create assistant messages that follow
-        the standard function-calling format, automatically converting ToolCall
-        objects to the proper dictionary format when needed.
+        the standard function-calling format. ToolCall objects and dicts are stored
+        as given and converted when the message is serialized; any other object
+        with a ``to_dict()`` method is converted here.
         
         Args:
             content: The message content
-            tool_calls: List of tool calls (ToolCall objects or dicts)
+            tool_calls: List of tool calls (ToolCall objects, dicts, or objects with ``to_dict()``)
             function_call: Function call (FunctionCall object or dict)
             
         Returns:
             ChatCompletionMessage object that can be used in conversation history
         """
-        # Convert tool calls to proper format
+        # ToolCall dataclasses and dicts serialize with the message; convert other
+        # objects now, since asdict() would deep-copy them (and fail on locks etc.)
         converted_tool_calls = None
         if tool_calls:
-            converted_tool_calls = []
-            for tool_call in tool_calls:
-                if hasattr(tool_call, 'to_dict'):
-                    converted_tool_calls.append(tool_call.to_dict())
-                else:
-                    converted_tool_calls.append(tool_call)
-        
+            converted_tool_calls = [
+                tool_call.to_dict()
+                if not is_dataclass(tool_call) and hasattr(tool_call, 'to_dict')
+                else tool_call
+                for tool_call in tool_calls
+            ]
+
         # Convert function call to proper format
         converted_function_call = None
         if function_call:
@@ -178,32 +250,43 @@ class ChatCompletions:
             json_data["tools"] = converted_tools
             # Normalize tool_choice if tools compatibility helpers are available
             normalized_tool_choice = tool_choice
-            try:
-                from ..tools.compatibility import normalize_tool_choice
-                normalized_tool_choice = normalize_tool_choice(tool_choice, converted_tools)
-            except Exception:
-                # If compatibility helpers aren't available, use the original value
-                normalized_tool_choice = tool_choice
+            if normalize_tool_choice is not None:
+                try:
+                    normalized_tool_choice = normalize_tool_choice(tool_choice, converted_tools)
+                except Exception:
+                    # If the choice can't be normalized, use the original value
+                    normalized_tool_choice = tool_choice
 
             if normalized_tool_choice is not None:
                 json_data["tool_choice"] = normalized_tool_choice
 
-        optional_params = {
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": top_p,
-            "frequency_penalty": frequency_penalty,
-            "presence_penalty": presence_penalty,
-            "stop": stop,
-            "user": user,
-            "n": n,
-            "logprobs": logprobs,
-            "top_logprobs": top_logprobs,
-            "response_format": response_format,
-            "seed": seed,
-            "hideThink": hide_think,
-        }
-        json_data.update({k: v for k, v in optional_params.items() if v is not None})
+        # Only send optional parameters that were actually set
+        if temperature is not None:
+            json_data["temperature"] = temperature
+        if max_tokens is not None:
+            json_data["max_tokens"] = max_tokens
+        if top_p is not None:
+            json_data["top_p"] = top_p
+        if frequency_penalty is not None:
+            json_data["frequency_penalty"] = frequency_penalty
+        if presence_penalty is not None:
+            json_data["presence_penalty"] = presence_penalty
+        if stop is not None:
+            json_data["stop"] = stop
+        if user is not None:
+            json_data["user"] = user
+        if n is not None:
+            json_data["n"] = n
+        if logprobs is not None:
+            json_data["logprobs"] = logprobs
+        if top_logprobs is not None:
+            json_data["top_logprobs"] = top_logprobs
+        if response_format is not None:
+            json_data["response_format"] = response_format
+        if seed is not None:
+            json_data["seed"] = seed
+        if hide_think is not None:
+            json_data["hideThink"] = hide_think
 
         # Add all other kwargs except None values
         for k, v in kwargs.items():
@@ -235,18 +318,20 @@ class ChatCompletions:
         """
         if tools is None:
             return None
-        
+
         # Cache the tools configuration for direct calling
         # Store both in _tools_config (legacy) and _last_chat_tools_config (new fallback)
         self._client._last_chat_tools_config = tools
-        self._client._mcp_manager = None  # Clear cached MCP manager
+        self._client._track_mcp_config(tools)  # Clear cached MCP manager if the servers changed
         
-        try:
-            from ..tools.compatibility import ensure_tool_call_format
-            return ensure_tool_call_format(tools)
-        except ImportError:
+        # Reuse the previous conversion when the same list of built-in names and
+        # standard tool dicts comes back unchanged
+        cached = self._client._converted_tools
+        if cached is not None and cached[0] is tools and _same_items(tools, cached[1]):
+            return cached[2]
+        
+        if ensure_tool_call_format is None:
             # Fallback if tools module not available - treat as legacy format
-            import warnings
             warnings.warn(
                 "Tools module not available. Install optional dependencies with: pip install 'HelpingAI[mcp]'. "
                 "Using legacy tool format."
@@ -254,52 +339,20 @@ class ChatCompletions:
             if isinstance(tools, list):
                 return tools
             return None
+        
+        try:
+            converted = ensure_tool_call_format(tools)
+            if isinstance(tools, list) and all(map(_is_cacheable_tool_item, tools)):
+                self._client._converted_tools = (tools, tuple(tools), converted)
+            return converted
         except Exception as e:
             # Enhanced error handling with better guidance
-            import warnings
             error_msg = str(e)
-            
-            # Provide more helpful error messages based on the error type
-            if "Unknown built-in tool" in error_msg:
-                available_tools = "code_interpreter, web_search"
-                warnings.warn(
-                    f"Tool conversion failed: {e}. "
-                    f"Available built-in tools: {available_tools}. "
-                    f"For custom tools, use the standard tool definition format. Using legacy behavior."
-                )
-            elif "Unsupported tool item type" in error_msg:
-                warnings.warn(
-                    f"Tool conversion failed: {e}. "
-                    f"Tools must be strings (built-in tool names), dicts (standard tool definition schema), "
-                    f"or MCP server configs. Using legacy behavior."
-                )
-            elif "Unsupported tools format" in error_msg:
-                warnings.warn(
-                    f"Tool conversion failed: {e}. "
-                    f"Supported formats: None, string (category), List[Dict] (standard tool definitions), "
-                    f"List[str] (built-in tools), or List[Fn]. Using legacy behavior."
-                )
-            elif "Failed to initialize MCP tools" in error_msg:
-                # Handle MCP-specific errors with helpful guidance
-                if "uvx" in error_msg:
-                    warnings.warn(
-                        f"Tool conversion failed: {e}. "
-                        f"Install uvx with: pip install uvx. Using legacy behavior."
-                    )
-                elif "npx" in error_msg:
-                    warnings.warn(
-                        f"Tool conversion failed: {e}. "
-                        f"Install Node.js and npm to use npx commands. Using legacy behavior."
-                    )
-                elif "fileno" in error_msg:
-                    warnings.warn(
-                        f"Tool conversion failed: {e}. "
-                        f"This may be due to a subprocess issue. Check MCP server configuration. Using legacy behavior."
-                    )
-                else:
-                    warnings.warn(f"Tool conversion failed: {e}. Using legacy behavior.")
-            else:
-                warnings.warn(f"Tool conversion failed: {e}. Using legacy behavior.")
+            hint = next(
+                (hint for markers, hint in _TOOL_ERROR_HINTS if all(marker in error_msg for marker in markers)),
+                "",
+            )
+            warnings.warn(f"Tool conversion failed: {e}. {hint}Using legacy behavior.")
             
             # Fallback to legacy behavior - filter out problematic items
             if isinstance(tools, list):
@@ -401,7 +454,7 @@ class ChatCompletions:
         messages = []
         for result in execution_results:
             if result["error"] is None:
-                content = json.dumps(result["result"]) if result["result"] is not None else "null"
+                content = _json_dumps_str(result["result"]) if result["result"] is not None else "null"
             else:
                 content = f"Error: {result['error']}"
             
@@ -411,48 +464,51 @@ class ChatCompletions:
             ))
         return messages
 
-    def _handle_response(self, data: Dict[str, Any]) -> ChatCompletion:
-        """Process a non-streaming response into a ChatCompletion object."""
-        choices = []
-        for choice_data in data.get("choices", []):
-            message_data = choice_data.get("message", {})
-            tool_calls = None
-            if "tool_calls" in message_data and message_data["tool_calls"] is not None:
-                tool_calls = []
-                for tc in message_data["tool_calls"]:
-                    if tc is not None and "function" in tc and tc["function"] is not None:
-                        tool_calls.append(ToolCall(
-                            id=tc.get("id", ""),
-                            type=tc.get("type", "function"),
-                            function=ToolFunction(
-                                name=tc["function"].get("name", ""),
-                                arguments=tc["function"].get("arguments", "")
-                            )
-                        ))
-
-            function_call = None
-            if "function_call" in message_data and message_data["function_call"] is not None:
-                fc = message_data["function_call"]
-                if fc is not None:
-                    function_call = FunctionCall(
-                        name=fc.get("name", ""),
-                        arguments=fc.get("arguments", "")
+    @staticmethod
+    def _parse_choice(choice_data: Dict[str, Any]) -> Choice:
+        """Build a Choice from one raw entry of a non-streaming response."""
+        message_data = choice_data.get("message", {})
+        tool_calls = None
+        tool_calls_data = message_data.get("tool_calls")
+        if tool_calls_data is not None:
+            tool_calls = [
+                ToolCall(
+                    id=tc.get("id", ""),
+                    type=tc.get("type", "function"),
+                    function=ToolFunction(
+                        name=tc["function"].get("name", ""),
+                        arguments=tc["function"].get("arguments", "")
                     )
-
-            message = ChatCompletionMessage(
-                role=message_data.get("role", ""),
-                content=message_data.get("content"),
-                function_call=function_call,
-                tool_calls=tool_calls
-            )
-            
-            choice = Choice(
-                index=choice_data.get("index", 0),
-                message=message,
-                finish_reason=choice_data.get("finish_reason"),
-                logprobs=choice_data.get("logprobs")
+                )
+                for tc in tool_calls_data
+                if tc is not None and tc.get("function") is not None
+            ]
+
+        function_call = None
+        fc = message_data.get("function_call")
+        if fc is not None:
+            function_call = FunctionCall(
+                name=fc.get("name", ""),
+                arguments=fc.get("arguments", "")
             )
-            choices.append(choice)
+
+        message = ChatCompletionMessage(
+            role=message_data.get("role", ""),
+            content=message_data.get("content"),
+            function_call=function_call,
+            tool_calls=tool_calls
+        )
+
+        return Choice(
+            index=choice_data.get("index", 0),
+            message=message,
+            finish_reason=choice_data.get("finish_reason"),
+            logprobs=choice_data.get("logprobs")
+        )
+
+    def _handle_response(self, data: Dict[str, Any]) -> ChatCompletion:
+        """Process a non-streaming response into a ChatCompletion object."""
+        choices = [self._parse_choice(choice_data) for choice_data in data.get("choices", [])]
 
         usage = None
         if "usage" in data:
@@ -471,64 +527,129 @@ class ChatCompletions:
             usage=usage
         )
 
+    @staticmethod
+    def _iter_raw_chunks(response: requests.Response) -> Iterator[bytes]:
+        """Yield response body bytes as soon as they arrive.
+
+        ``iter_content`` returns each piece of a chunked body immediately, but on
+        bodies without chunked encoding (``Connection: close``, HTTP/1.0 proxies)
+        it blocks until a full read size has arrived. Those are read with
+        urllib3's ``read1``, which returns whatever is already available.
+        """
+        raw = getattr(response, "raw", None)
+        read1 = getattr(raw, "read1", None)
+        if read1 is None or getattr(raw, "chunked", True):
+            yield from response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)
+            return
+        # Map urllib3 errors the way iter_content does
+        try:
+            while True:
+                chunk = read1(_STREAM_CHUNK_SIZE, decode_content=True)
+                if not chunk:
+                    return
+                yield chunk
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except urllib3.exceptions.DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except urllib3.exceptions.SSLError as e:
+            raise requests.exceptions.SSLError(e)
+
+    @staticmethod
+    def _iter_sse_lines(response: requests.Response) -> Iterator[List[bytes]]:
+        """Split the raw response byte stream into SSE lines without decoding.
+
+        Yields the complete lines from each network read as one batch, so the
+        generator is resumed once per read rather than once per line.
+        """
+        buf = bytearray()
+        for chunk in ChatCompletions._iter_raw_chunks(response):
+            buf += chunk
+            lines = []
+            start = 0
+            nl = buf.find(b"\n")
+            while nl != -1:
+                end = nl - 1 if nl > start and buf[nl - 1] == 0x0D else nl
+                lines.append(bytes(buf[start:end]))
+                start = nl + 1
+                nl = buf.find(b"\n", start)
+            if start:
+                del buf[:start]
+                yield lines
+        if buf:
+            yield [bytes(buf)]
+
     def _handle_stream_response(self, response: requests.Response) -> Iterator[ChatCompletionChunk]:
         """Handle streaming response and yield ChatCompletionChunk objects."""
-        for line in response.iter_lines():
-            if line:
-                if line.strip() == b"data: [DONE]":
-                    break
+        # Bind hot globals to locals once; this loop runs per streamed token
+        loads = _json_loads
+        _ToolCall = ToolCall
+        _ToolFunction = ToolFunction
+        _FunctionCall = FunctionCall
+        _ChoiceDelta = ChoiceDelta
+        _Choice = Choice
+        _Chunk = ChatCompletionChunk
+        for lines in self._iter_sse_lines(response):
+            for line in lines:
+                if not line.startswith(b"data: "):
+                    # Blank separators, ":" keepalive comments and other SSE fields carry no payload
+                    continue
+                payload = line[6:]
+                if payload.rstrip() == b"[DONE]":
+                    return
                 try:
-                    line = line.decode("utf-8")
-                    if line.startswith("data: "):
-                        data = json.loads(line[6:])
-                        choices = []
-                        for choice_data in data.get("choices", []):
-                            delta_data = choice_data.get("delta", {})
-                            
-                            tool_calls = None
-                            if "tool_calls" in delta_data and delta_data["tool_calls"] is not None:
-                                tool_calls = []
-                                for tc in delta_data["tool_calls"]:
-                                    if tc is not None and "function" in tc and tc["function"] is not None:
-                                        tool_calls.append(ToolCall(
-                                            id=tc.get("id", ""),
-                                            type=tc.get("type", "function"),
-                                            function=ToolFunction(
-                                                name=tc["function"].get("name", ""),
-                                                arguments=tc["function"].get("arguments", "")
-                                            )
-                                        ))
-
-                            function_call = None
-                            if "function_call" in delta_data and delta_data["function_call"] is not None:
-                                fc = delta_data["function_call"]
-                                if fc is not None:
-                                    function_call = FunctionCall(
-                                        name=fc.get("name", ""),
-                                        arguments=fc.get("arguments", "")
+                    data = loads(payload)
+                    choices = []
+                    for choice_data in data.get("choices", []):
+                        delta_data = choice_data.get("delta", {})
+
+                        tool_calls = None
+                        tool_calls_data = delta_data.get("tool_calls")
+                        if tool_calls_data is not None:
+                            tool_calls = [
+                                _ToolCall(
+                                    id=tc.get("id", ""),
+                                    type=tc.get("type", "function"),
+                                    function=_ToolFunction(
+                                        name=tc["function"].get("name", ""),
+                                        arguments=tc["function"].get("arguments", "")
                                     )
-
-                            delta = ChoiceDelta(
-                                content=delta_data.get("content"),
-                                function_call=function_call,
-                                role=delta_data.get("role"),
-                                tool_calls=tool_calls
-                            )
-                            
-                            choice = Choice(
-                                index=choice_data.get("index", 0),
-                                delta=delta,
-                                finish_reason=choice_data.get("finish_reason"),
-                                logprobs=choice_data.get("logprobs")
+                                )
+                                for tc in tool_calls_data
+                                if tc is not None and tc.get("function") is not None
+                            ]
+
+                        function_call = None
+                        fc = delta_data.get("function_call")
+                        if fc is not None:
+                            function_call = _FunctionCall(
+                                name=fc.get("name", ""),
+                                arguments=fc.get("arguments", "")
                             )
-                            choices.append(choice)
-
-                        yield ChatCompletionChunk(
-                            id=data.get("id", ""),
-                            created=data.get("created", 0),
-                            model=data.get("model", ""),
-                            choices=choices,
-                            system_fingerprint=data.get("system_fingerprint")
+
+                        delta = _ChoiceDelta(
+                            content=delta_data.get("content"),
+                            function_call=function_call,
+                            role=delta_data.get("role"),
+                            tool_calls=tool_calls
+                        )
+
+                        choice = _Choice(
+                            index=choice_data.get("index", 0),
+                            delta=delta,
+                            finish_reason=choice_data.get("finish_reason"),
+                            logprobs=choice_data.get("logprobs")
                         )
+                        choices.append(choice)
+
+                    yield _Chunk(
+                        id=data.get("id", ""),
+                        created=data.get("created", 0),
+                        model=data.get("model", ""),
+                        choices=choices,
+                        system_fingerprint=data.get("system_fingerprint")
+                    )
                 except Exception as e:
                     raise HAIError(f"Error parsing stream: {str(e)}")
\ No newline at end of file
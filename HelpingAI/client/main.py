@@ -4,12 +4,154 @@ This is the main entry point for interacting with the HelpingAI API.
 """
 
 import json
-from typing import Optional, Dict, Any, Union, List
+import threading
+import warnings
+import weakref
+from typing import Optional, Dict, Any, Union, List, Tuple, Callable, Set
 
-from .base import BaseClient
+import requests
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+from .base import BaseClient, _DEFAULT_MAX_RETRIES, _DEFAULT_POOL_MAXSIZE
 from .chat import Chat
+from .completions import _same_items
 from ..models import Models
 
+try:
+    from ..tools import get_registry
+    from ..tools.builtin_tools import get_builtin_tool_class
+    from ..tools.mcp_manager import MCPManager
+except ImportError:  # tool calling support is optional
+    get_registry = get_builtin_tool_class = MCPManager = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _mcp_sig(tools: Optional[Union[List[Dict[str, Any]], List, str]]) -> Tuple[Tuple[str, str], ...]:
+    """Summarize the MCP servers configured in ``tools`` so changes can be detected."""
+    if not isinstance(tools, list):
+        return ()
+    return tuple(sorted(
+        (name, json.dumps(server_config, sort_keys=True, default=str))
+        for item in tools
+        if isinstance(item, dict) and isinstance(item.get("mcpServers"), dict)
+        for name, server_config in item["mcpServers"].items()
+    ))
+
+
+def _args_from_none(arguments: None, tool_name: str) -> Dict[str, Any]:
+    return {}
+
+
+def _args_from_dict(arguments: Dict[str, Any], tool_name: str) -> Dict[str, Any]:
+    return arguments
+
+
+# Tools already warned about receiving a set instead of a dict
+_WARNED_SET_ARGS: Set[str] = set()
+
+
+def _args_from_set(arguments: set, tool_name: str) -> Dict[str, Any]:
+    # Handle common mistake: user used {json_string} which creates a set
+    if len(arguments) == 1:
+        # Try to extract and parse the single item
+        json_str = next(iter(arguments))
+        if isinstance(json_str, str):
+            try:
+                parsed = _json_loads(json_str)
+                if isinstance(parsed, dict):
+                    if tool_name not in _WARNED_SET_ARGS:
+                        _WARNED_SET_ARGS.add(tool_name)
+                        # stacklevel points at the client.call() caller
+                        warnings.warn(
+                            f"Detected set argument for '{tool_name}'. Use 'json.loads(tool_call.function.arguments)' instead of '{{tool_call.function.arguments}}'",
+                            stacklevel=4,
+                        )
+                    return parsed
+            except json.JSONDecodeError:
+                pass
+    
+    raise ValueError(
+        f"Invalid arguments for tool '{tool_name}': received a set {arguments}. "
+        f"Common mistake: use 'json.loads(tool_call.function.arguments)' instead of '{{tool_call.function.arguments}}'"
+    )
+
+
+def _args_from_str(arguments: str, tool_name: str) -> Dict[str, Any]:
+    # Tools without parameters commonly get "" or "{}"; skip the parser for those
+    stripped = arguments.strip()
+    if not stripped or stripped == "{}":
+        return {}
+    try:
+        parsed = _json_loads(stripped)
+        if isinstance(parsed, dict):
+            return parsed
+        else:
+            raise ValueError(f"Invalid arguments for tool '{tool_name}': JSON string must parse to a dictionary, got {type(parsed)}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON arguments for tool '{tool_name}': {e}")
+
+
+def _args_from_other(arguments: Any, tool_name: str) -> Dict[str, Any]:
+    # Subclasses of the supported types are handled like the type itself
+    for base in (dict, set, str):
+        if isinstance(arguments, base):
+            return _ARG_DISPATCH[base](arguments, tool_name)
+    raise ValueError(
+        f"Invalid arguments for tool '{tool_name}': expected dict, JSON string, but got {type(arguments)}. "
+        f"Received: {arguments}"
+    )
+
+
+def _build_not_found_error(tool_name: str, effective_tools_config: Any) -> str:
+    """Build the guidance message for a tool that client.call() could not find."""
+    headline = f"Tool '{tool_name}' not found"
+    
+    # Check if this looks like an MCP tool name pattern ({server_name}-{tool_name})
+    is_mcp_pattern = '-' in tool_name
+    if is_mcp_pattern and effective_tools_config:
+        headline += f". Tool '{tool_name}' appears to be an MCP tool but MCP servers may not be properly initialized. Check that the MCP server is running and accessible."
+    elif is_mcp_pattern:
+        headline += f". Tool '{tool_name}' appears to be an MCP tool but no tools are configured."
+    elif not effective_tools_config:
+        headline += ". No tools are currently configured."
+    else:
+        headline += " in registry, built-in tools, or configured MCP tools"
+    
+    if effective_tools_config:
+        return headline
+    
+    # Add helpful guidance when no tools are configured
+    return "\n".join([
+        headline,
+        "",
+        "To use tools with client.call(), you have two options:",
+        "1. First call chat.completions.create() with tools, then call client.call():",
+        "   response = client.chat.completions.create(model='gpt-4', messages=[...], tools=[...])",
+        "   result = client.call('tool_name', {'arg': 'value'})",
+        "2. Configure tools directly on the client:",
+        "   client.configure_tools([...])  # Then use client.call()",
+    ])
+
+
+# Argument handlers for client.call(), by exact argument type
+_ARG_DISPATCH = {
+    dict: _args_from_dict,
+    str: _args_from_str,
+    set: _args_from_set,
+    type(None): _args_from_none,
+}
+
+
+# Signatures of the MCP server configs already initialized on each MCPManager.
+# Keyed weakly so a manager that was shut down and replaced drops its entry.
+_MCP_INITIALIZED: "weakref.WeakKeyDictionary[Any, Set[Tuple[Tuple[str, str], ...]]]" = weakref.WeakKeyDictionary()
+_MCP_INIT_LOCK = threading.Lock()
+
 
 class HAI(BaseClient):
     """HAI API client for the HelpingAI platform.
@@ -23,6 +165,9 @@ class HAI(BaseClient):
         organization: Optional[str] = None,
         base_url: Optional[str] = None,
         timeout: float = 60.0,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        session: Optional[requests.Session] = None,
+        pool_maxsize: int = _DEFAULT_POOL_MAXSIZE,
     ) -> None:
         """Initialize HAI client.
 
@@ -31,13 +176,29 @@ class HAI(BaseClient):
             organization: Optional organization ID for API requests
             base_url: Override the default API base URL
             timeout: Timeout for API requests in seconds
+            max_retries: Retries for connection errors and 429/502/503/504 responses
+            session: Optional requests.Session to send requests with. By default clients
+                share one pooled session so connections are reused across instances; it
+                keeps no cookies, and changes to ``client.session`` affect every client
+                sharing it. Pass your own session to customize it for one client.
+            pool_maxsize: Keep-alive connections to keep per host when no session is given.
+                Raise it for highly concurrent use of one client.
         """
-        super().__init__(api_key, organization, base_url, timeout)
+        super().__init__(api_key, organization, base_url, timeout, max_retries, session, pool_maxsize)
         self.chat: Chat = Chat(self)
         self.models: Models = Models(self)
         self._tools_config: Optional[Union[List[Dict[str, Any]], List, str]] = None
         self._last_chat_tools_config: Optional[Union[List[Dict[str, Any]], List, str]] = None
         self._mcp_manager = None
+        self._mcp_config_sig: Tuple[Tuple[str, str], ...] = ()
+        # (tools list, snapshot of its items, converted definitions) from the last conversion
+        self._converted_tools: Optional[Tuple[List, Tuple, Optional[List[Dict[str, Any]]]]] = None
+        # (tools list, snapshot of its items, MCP server configs found in it)
+        self._mcp_configs_cache: Optional[Tuple[List, Tuple, List[Dict[str, Any]]]] = None
+        # (manager indexed, number of its MCP clients, {"server-tool": (client_id, mcp_tool)})
+        self._mcp_tool_index: Tuple[Any, int, Dict[str, Tuple[str, Any]]] = (None, -1, {})
+        # Bound Fn.call handlers for built-in and MCP tools resolved by call(), by tool name
+        self._dispatch_cache: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
         
     def configure_tools(self, tools: Optional[Union[List[Dict[str, Any]], List, str]]) -> None:
         """Configure tools for this client instance.
@@ -61,10 +222,50 @@ class HAI(BaseClient):
             ])
         """
         self._tools_config = tools
-        # Clear cached MCP manager to force reinitialization
-        self._mcp_manager = None
+        # Clear cached MCP manager to force reinitialization if the MCP servers changed
+        self._track_mcp_config(tools)
         # Clear cached chat tools since we're explicitly configuring tools
         self._last_chat_tools_config = None
+        self._converted_tools = None
+        self._dispatch_cache.clear()
+    
+    def _track_mcp_config(self, tools: Optional[Union[List[Dict[str, Any]], List, str]]) -> None:
+        """Drop the cached MCP manager when ``tools`` configures different MCP servers.
+        
+        Reinitializing the manager starts new MCP server processes, so it is kept
+        when the same servers are configured again.
+        """
+        sig = _mcp_sig(tools)
+        if sig != self._mcp_config_sig:
+            self._mcp_config_sig = sig
+            self._mcp_manager = None
+            self._mcp_tool_index = (None, -1, {})
+            self._dispatch_cache.clear()
+    
+    def shutdown(self) -> None:
+        """Shut down the MCP servers started for this client's tools.
+        
+        MCP server connections are shared across the process, so this also stops
+        them for other clients. Every client notices the shutdown and starts the
+        servers again on its next MCP tool call.
+        """
+        if self._mcp_manager is not None:
+            self._mcp_manager.shutdown()
+        self._mcp_manager = None
+        self._mcp_tool_index = (None, -1, {})
+        self._dispatch_cache.clear()
+    
+    def _drop_stopped_mcp_manager(self) -> None:
+        """Forget the cached MCP manager and its handlers once it has been shut down.
+        
+        ``MCPManager.shutdown()`` clears the process-wide instance, so a manager
+        that is no longer that instance must not receive further calls.
+        """
+        manager = self._mcp_manager
+        if isinstance(manager, MCPManager) and MCPManager._instance is not manager:
+            self._mcp_manager = None
+            self._mcp_tool_index = (None, -1, {})
+            self._dispatch_cache.clear()
     
     def _get_effective_tools_config(self) -> Optional[Union[List[Dict[str, Any]], List, str]]:
         """Get effective tools configuration from instance configuration or recent chat.completions.create() call.
@@ -80,15 +281,11 @@ class HAI(BaseClient):
             Tools configuration from instance, recent chat call, or None if not configured
         """
         # First priority: explicitly configured tools via configure_tools()
-        if self._tools_config is not None:
-            return self._tools_config
-            
         # Second priority: tools from most recent chat.completions.create() call
         # This enables the workflow: chat.completions.create(tools=...) -> client.call(tool_name, args)
-        if hasattr(self, '_last_chat_tools_config') and self._last_chat_tools_config is not None:
-            return self._last_chat_tools_config
-            
-        return None
+        # Both attributes are always set in __init__, so no hasattr() check is needed
+        tools_config = self._tools_config
+        return tools_config if tools_config is not None else self._last_chat_tools_config
     
     def _convert_tools_parameter(
         self,
@@ -130,10 +327,8 @@ class HAI(BaseClient):
         if tools is not None:
             self.configure_tools(tools)
         
-        # Import here to avoid circular imports
-        from ..tools import get_registry
-        from ..tools.builtin_tools import get_builtin_tool_class, is_builtin_tool
-        from ..tools.mcp_manager import MCPManager
+        if get_registry is None:
+            raise ImportError("client.call() requires the HelpingAI tools module")
         
         # Enhanced argument processing with better error handling
         processed_args = self._process_arguments(arguments, tool_name)
@@ -144,16 +339,24 @@ class HAI(BaseClient):
             result = tool.call(processed_args)
             return result
         
-        # If not found, check if it's a built-in tool
-        if is_builtin_tool(tool_name):
-            builtin_class = get_builtin_tool_class(tool_name)
-            if builtin_class:
-                # Create an instance of the built-in tool
-                builtin_tool = builtin_class()
-                # Convert it to an Fn object and call it
-                fn_tool = builtin_tool.to_fn()
-                result = fn_tool.call(processed_args)
-                return result
+        # Another client may have shut down the shared MCP manager since the last call
+        self._drop_stopped_mcp_manager()
+        
+        # Dispatch straight to the built-in or MCP tool resolved on an earlier call
+        handler = self._dispatch_cache.get(tool_name)
+        if handler is not None:
+            return handler(processed_args)
+        
+        # If not found, check if it's a built-in tool (one lookup covers both checks)
+        builtin_class = get_builtin_tool_class(tool_name)
+        if builtin_class:
+            # Create an instance of the built-in tool
+            builtin_tool = builtin_class()
+            # Convert it to an Fn object and call it
+            fn_tool = builtin_tool.to_fn()
+            self._dispatch_cache[tool_name] = fn_tool.call
+            result = fn_tool.call(processed_args)
+            return result
         
         # If not found, check if it's an MCP tool using effective configuration
         # MCP tools are named with pattern: {server_name}-{tool_name}
@@ -165,52 +368,72 @@ class HAI(BaseClient):
                     self._mcp_manager = self._get_mcp_manager_for_tools(effective_tools_config)
                 
                 if self._mcp_manager and self._mcp_manager.clients:
-                    # Check if any MCP client has this tool
-                    for client_id, client in self._mcp_manager.clients.items():
-                        if hasattr(client, 'tools'):
-                            for mcp_tool in client.tools:
-                                # Extract server name from client_id (format: {server_name}_{uuid})
-                                server_name = client_id.split('_')[0]
-                                expected_tool_name = f"{server_name}-{mcp_tool.name}"
-                                
-                                if expected_tool_name == tool_name:
-                                    # Found the MCP tool, create an Fn and call it
-                                    fn_tool = self._mcp_manager._create_mcp_tool_fn(
-                                        name=tool_name,
-                                        client_id=client_id,
-                                        mcp_tool_name=mcp_tool.name,
-                                        description=mcp_tool.description if hasattr(mcp_tool, 'description') else f"MCP tool: {tool_name}",
-                                        parameters=mcp_tool.inputSchema if hasattr(mcp_tool, 'inputSchema') else {'type': 'object', 'properties': {}, 'required': []}
-                                    )
-                                    result = fn_tool.call(processed_args)
-                                    return result
+                    entry = self._get_mcp_tool_index(self._mcp_manager).get(tool_name)
+                    if entry is not None:
+                        # Found the MCP tool, create an Fn and call it
+                        client_id, mcp_tool = entry
+                        fn_tool = self._mcp_manager._create_mcp_tool_fn(
+                            name=tool_name,
+                            client_id=client_id,
+                            mcp_tool_name=mcp_tool.name,
+                            description=mcp_tool.description if hasattr(mcp_tool, 'description') else f"MCP tool: {tool_name}",
+                            parameters=mcp_tool.inputSchema if hasattr(mcp_tool, 'inputSchema') else {'type': 'object', 'properties': {}, 'required': []}
+                        )
+                        self._dispatch_cache[tool_name] = fn_tool.call
+                        result = fn_tool.call(processed_args)
+                        return result
             except ImportError:
                 # MCP package not available, skip MCP tool checking
                 pass
         
         # If still not found, provide a helpful error message with guidance
-        error_msg = f"Tool '{tool_name}' not found"
+        raise ValueError(_build_not_found_error(tool_name, effective_tools_config))
+    
+    def _get_mcp_tool_index(self, manager: Any) -> Dict[str, Tuple[str, Any]]:
+        """Get the index of MCP tools exposed by the manager's clients.
         
-        # Check if this looks like an MCP tool name pattern
-        if '-' in tool_name and effective_tools_config:
-            error_msg += f". Tool '{tool_name}' appears to be an MCP tool but MCP servers may not be properly initialized. Check that the MCP server is running and accessible."
-        elif '-' in tool_name and not effective_tools_config:
-            error_msg += f". Tool '{tool_name}' appears to be an MCP tool but no tools are configured."
-        elif not effective_tools_config:
-            error_msg += ". No tools are currently configured."
-        else:
-            error_msg += " in registry, built-in tools, or configured MCP tools"
+        MCP clients are only ever added to a manager, so the index is rebuilt
+        whenever the manager or its number of clients changes.
+        
+        Args:
+            manager: MCPManager whose clients should be indexed
+            
+        Returns:
+            Mapping of "{server_name}-{tool_name}" to (client_id, mcp_tool)
+        """
+        clients = manager.clients
+        indexed, size, index = self._mcp_tool_index
+        if indexed is not manager or size != len(clients):
+            index = {}
+            for client_id, client in list(clients.items()):
+                # Extract server name from client_id (format: {server_name}_{uuid})
+                prefix = client_id.partition('_')[0] + '-'
+                for mcp_tool in getattr(client, 'tools', ()):
+                    # The first client exposing a name wins, as with a linear scan
+                    index.setdefault(prefix + mcp_tool.name, (client_id, mcp_tool))
+            self._mcp_tool_index = (manager, len(clients), index)
+        return index
+    
+    def _find_mcp_configs(self, tools_config: Optional[Union[List[Dict[str, Any]], List, str]]) -> List[Dict[str, Any]]:
+        """Get the MCP server configs in a tools configuration.
         
-        # Add helpful guidance based on the situation
-        if not effective_tools_config:
-            error_msg += "\n\nTo use tools with client.call(), you have two options:"
-            error_msg += "\n1. First call chat.completions.create() with tools, then call client.call():"
-            error_msg += "\n   response = client.chat.completions.create(model='gpt-4', messages=[...], tools=[...])"
-            error_msg += "\n   result = client.call('tool_name', {'arg': 'value'})"
-            error_msg += "\n2. Configure tools directly on the client:"
-            error_msg += "\n   client.configure_tools([...])  # Then use client.call()"
+        The result for the last list scanned is reused while that list still
+        holds the same items.
+        
+        Args:
+            tools_config: Tools configuration to scan
             
-        raise ValueError(error_msg)
+        Returns:
+            The items of ``tools_config`` that configure MCP servers
+        """
+        if not isinstance(tools_config, list):
+            return []
+        cached = self._mcp_configs_cache
+        if cached is not None and cached[0] is tools_config and _same_items(tools_config, cached[1]):
+            return cached[2]
+        mcp_configs = [item for item in tools_config if isinstance(item, dict) and "mcpServers" in item]
+        self._mcp_configs_cache = (tools_config, tuple(tools_config), mcp_configs)
+        return mcp_configs
     
     def _get_mcp_manager_for_tools(self, tools_config: Optional[Union[List[Dict[str, Any]], List, str]] = None) -> Optional[Any]:
         """Get or create MCP manager using specified or cached tools configuration.
@@ -224,18 +447,12 @@ class HAI(BaseClient):
         if tools_config is None:
             tools_config = self._get_effective_tools_config()
             
-        if not tools_config:
+        if not tools_config or MCPManager is None:
             return None
             
         try:
-            from ..tools.mcp_manager import MCPManager
-            
             # Find MCP server configs in the tools configuration
-            mcp_configs = []
-            if isinstance(tools_config, list):
-                for item in tools_config:
-                    if isinstance(item, dict) and "mcpServers" in item:
-                        mcp_configs.append(item)
+            mcp_configs = self._find_mcp_configs(tools_config)
             
             if not mcp_configs:
                 return None
@@ -243,14 +460,21 @@ class HAI(BaseClient):
             # Initialize MCP manager with the found configurations
             manager = MCPManager()
             
-            # Initialize each MCP config (this populates manager.clients)
-            for config in mcp_configs:
-                try:
-                    manager.init_config(config)  # This returns tools but also populates clients
-                except Exception as e:
-                    # If initialization fails, continue with other configs
-                    print(f"Warning: Failed to initialize MCP config {config}: {e}")
-                    continue
+            # Initialize each MCP config (this populates manager.clients). The manager
+            # is shared process-wide, so servers another client already started are reused
+            with _MCP_INIT_LOCK:
+                initialized = _MCP_INITIALIZED.setdefault(manager, set())
+                for config in mcp_configs:
+                    sig = _mcp_sig([config])
+                    if sig in initialized:
+                        continue
+                    try:
+                        manager.init_config(config)  # This returns tools but also populates clients
+                        initialized.add(sig)
+                    except Exception as e:
+                        # If initialization fails, continue with other configs
+                        print(f"Warning: Failed to initialize MCP config {config}: {e}")
+                        continue
             
             return manager if manager.clients else None
             
@@ -276,46 +500,5 @@ class HAI(BaseClient):
         Raises:
             ValueError: If arguments cannot be processed
         """
-        # Handle None or empty arguments
-        if arguments is None:
-            return {}
-        
-        # If it's already a dict, return as-is
-        if isinstance(arguments, dict):
-            return arguments
-        
-        # Handle common mistake: user used {json_string} which creates a set
-        if isinstance(arguments, set):
-            if len(arguments) == 1:
-                # Try to extract and parse the single item
-                json_str = next(iter(arguments))
-                if isinstance(json_str, str):
-                    try:
-                        parsed = json.loads(json_str)
-                        if isinstance(parsed, dict):
-                            print(f"⚠️  Note: Detected set argument for '{tool_name}'. Use 'json.loads(tool_call.function.arguments)' instead of '{{tool_call.function.arguments}}'")
-                            return parsed
-                    except json.JSONDecodeError:
-                        pass
-            
-            raise ValueError(
-                f"Invalid arguments for tool '{tool_name}': received a set {arguments}. "
-                f"Common mistake: use 'json.loads(tool_call.function.arguments)' instead of '{{tool_call.function.arguments}}'"
-            )
-        
-        # Handle JSON string
-        if isinstance(arguments, str):
-            try:
-                parsed = json.loads(arguments)
-                if isinstance(parsed, dict):
-                    return parsed
-                else:
-                    raise ValueError(f"Invalid arguments for tool '{tool_name}': JSON string must parse to a dictionary, got {type(parsed)}")
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON arguments for tool '{tool_name}': {e}")
-        
-        # Handle other types
-        raise ValueError(
-            f"Invalid arguments for tool '{tool_name}': expected dict, JSON string, but got {type(arguments)}. "
-            f"Received: {arguments}"
-        )
\ No newline at end of file
+        handler = _ARG_DISPATCH.get(type(arguments), _args_from_other)
+        return handler(arguments, tool_name)
\ No newline at end of file
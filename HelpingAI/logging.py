@@ -4,13 +4,19 @@ Provides structured logging with different levels and optional file output.
 """
 
 import os
+import re
 import sys
 import datetime
+import traceback
 from enum import Enum
 from typing import Optional, TextIO, Any, Dict
 from pathlib import Path
 
 
+# ANSI color codes, stripped from messages written to log files
+_ANSI_ESCAPE_RE = re.compile(r'\033\[[0-9;]*m')
+
+
 class LogLevel(Enum):
     """Log levels for the custom logging system."""
     DEBUG = 0
@@ -139,8 +145,7 @@ class HAILogger:
             try:
                 with open(self.file_path, 'a', encoding='utf-8') as f:
                     # Remove ANSI color codes for file output
-                    import re
-                    clean_message = re.sub(r'\033\[[0-9;]*m', '', formatted_message)
+                    clean_message = _ANSI_ESCAPE_RE.sub('', formatted_message)
                     f.write(clean_message + '\n')
                     f.flush()
             except Exception as e:
@@ -167,8 +172,8 @@ class HAILogger:
             exc_info: Whether to include exception traceback
             **kwargs: Additional context
         """
-        if exc_info:
-            import traceback
+        # Formatting the traceback walks the stack; skip it if the level is filtered
+        if exc_info and self._should_log(LogLevel.ERROR):
             tb = traceback.format_exc()
             message = f"{message}\nTraceback:\n{tb}"
         
@@ -182,8 +187,8 @@ class HAILogger:
             exc_info: Whether to include exception traceback
             **kwargs: Additional context
         """
-        if exc_info:
-            import traceback
+        # Formatting the traceback walks the stack; skip it if the level is filtered
+        if exc_info and self._should_log(LogLevel.CRITICAL):
             tb = traceback.format_exc()
             message = f"{message}\nTraceback:\n{tb}"
         
@@ -6,6 +6,7 @@ that are compatible with the HelpingAI tools framework.
 """
 
 import os
+import shutil
 import tempfile
 from abc import ABC, abstractmethod
 from pathlib import Path
@@ -16,6 +17,8 @@ from urllib.request import urlopen
 from ..core import Fn
 from ..errors import ToolExecutionError
 
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class BuiltinToolBase(ABC):
     """Base class for built-in tools.
@@ -130,9 +133,10 @@ class BuiltinToolBase(ABC):
             
             file_path = os.path.join(self.work_dir, filename)
             
+            # Copy in bounded chunks so large downloads never sit in memory whole
             with urlopen(url) as response:
                 with open(file_path, 'wb') as f:
-                    f.write(response.read())
+                    shutil.copyfileobj(response, f, _DOWNLOAD_CHUNK_SIZE)
             
             return file_path
             
@@ -201,10 +205,5 @@ class BuiltinToolBase(ABC):
     
     def _cleanup_work_dir(self) -> None:
         """Clean up the working directory."""
-        try:
-            import shutil
-            if os.path.exists(self.work_dir):
-                shutil.rmtree(self.work_dir)
-        except Exception:
-            # Ignore cleanup errors
-            pass
\ No newline at end of file
+        # Ignore cleanup errors, including an already-missing directory
+        shutil.rmtree(self.work_dir, ignore_errors=True)
\ No newline at end of file
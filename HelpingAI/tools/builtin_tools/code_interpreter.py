@@ -22,6 +22,9 @@ from typing import Dict, Any, Optional
 from .base import BuiltinToolBase
 from ..errors import ToolExecutionError
 
+# Image files picked up from the work directory after a run
+_IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.svg')
+
 
 class CodeInterpreterTool(BuiltinToolBase):
     """Advanced Python code execution sandbox with data science capabilities.
@@ -145,9 +148,11 @@ class CodeInterpreterTool(BuiltinToolBase):
         except Exception as e:
             return f"Code execution error: {e}"
         finally:
-            # Clean up script file
-            if os.path.exists(script_file):
+            # Clean up script file; it may never have been written
+            try:
                 os.remove(script_file)
+            except FileNotFoundError:
+                pass
     
     def _prepare_code(self, code: str) -> str:
         """Prepare code with necessary imports and setup.
@@ -224,11 +229,15 @@ if _HAS_MATPLOTLIB:
             List of image result strings
         """
         image_results = []
-        image_files = []
         
-        # Look for image files in work directory
-        for ext in ['*.png', '*.jpg', '*.jpeg', '*.svg']:
-            image_files.extend(Path(self.work_dir).glob(ext))
+        # Look for image files in work directory with a single directory scan
+        with os.scandir(self.work_dir) as entries:
+            image_files = [
+                Path(entry.path) for entry in entries
+                if entry.name.endswith(_IMAGE_SUFFIXES)
+                and not entry.name.startswith('.')
+                and entry.is_file()
+            ]
         
         for idx, image_file in enumerate(sorted(image_files), 1):
             try:
@@ -368,10 +368,7 @@ def _handle_builtin_tool(tool_name: str) -> Optional[Dict[str, Any]]:
         Tool definition in the standard tool calling format, or None if tool not found
     """
     try:
-        from .builtin_tools import get_builtin_tool_class, is_builtin_tool
-        
-        if not is_builtin_tool(tool_name):
-            return None
+        from .builtin_tools import get_builtin_tool_class
         
         tool_class = get_builtin_tool_class(tool_name)
         if tool_class is None:
@@ -5,9 +5,17 @@ import inspect
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, Callable, Union, List
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
 from .schema import generate_schema_from_function, validate_schema
 from .errors import ToolExecutionError, SchemaValidationError, ToolRegistrationError
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 @dataclass
 class Fn:
@@ -69,7 +77,7 @@ class Fn:
         
         if isinstance(arguments, str):
             try:
-                args_dict = json.loads(arguments)
+                args_dict = _json_loads(arguments)
             except json.JSONDecodeError as e:
                 raise ValueError(f"Invalid JSON arguments for tool '{self.name}': {e}")
         else:
@@ -374,6 +374,11 @@ class MCPManager:
         self.loop.call_soon_threadsafe(self.loop.stop)
         self.loop_thread.join()
 
+        # A stopped manager cannot serve new connections, so the next
+        # MCPManager() starts a fresh one
+        if MCPManager._instance is self:
+            MCPManager._instance = None
+
 
 def _cleanup_mcp(_sig_num=None, _frame=None):
     """Cleanup function for MCP manager on exit."""
@@ -1,6 +1,7 @@
 """Tool registry for managing decorated tools."""
 
 from threading import Lock
+from types import MappingProxyType
 from typing import Dict, List, Optional, Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -10,11 +11,20 @@ from .errors import ToolRegistrationError
 
 
 class ToolRegistry:
-    """Thread-safe global registry for managing decorated tools."""
+    """Thread-safe global registry for managing decorated tools.
+    
+    Writers mutate ``_tools`` under the lock and then publish a read-only
+    copy; readers use that snapshot without locking.
+    """
     
     def __init__(self):
         self._tools: Dict[str, 'Fn'] = {}
         self._lock = Lock()
+        self._snapshot = MappingProxyType({})
+    
+    def _publish(self) -> None:
+        """Publish the current tools as a new snapshot (call with the lock held)."""
+        self._snapshot = MappingProxyType(dict(self._tools))
     
     def register(self, fn: 'Fn') -> None:
         """Register a tool function.
@@ -31,6 +41,7 @@ class ToolRegistry:
                 return
             
             self._tools[fn.name] = fn
+            self._publish()
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name.
@@ -41,6 +52,7 @@ class ToolRegistry:
         with self._lock:
             if name in self._tools:
                 self._tools.pop(name)
+                self._publish()
     
     def get_tools(self, names: List[str] = None) -> List['Fn']:
         """Get registered tools with filtering.
@@ -51,19 +63,14 @@ class ToolRegistry:
         Returns:
             List of matching Fn objects
         """
-        with self._lock:
-            results = []
-            
-            if names:
-                # Get specific tools by name
-                for name in names:
-                    if name in self._tools:
-                        results.append(self._tools[name])
-            else:
-                # Get all tools
-                results.extend(self._tools.values())
-            
-            return results
+        tools = self._snapshot
+        
+        if names:
+            # Get specific tools by name
+            return [tools[name] for name in names if name in tools]
+        
+        # Get all tools
+        return list(tools.values())
     
     def get_tool(self, name: str) -> Optional['Fn']:
         """Get a specific tool by name.
@@ -74,8 +81,7 @@ class ToolRegistry:
         Returns:
             Fn object if found, None otherwise
         """
-        with self._lock:
-            return self._tools.get(name)
+        return self._snapshot.get(name)
     
     def list_tool_names(self) -> List[str]:
         """List all registered tool names.
@@ -102,6 +108,7 @@ class ToolRegistry:
         """Clear all registered tools (mainly for testing)."""
         with self._lock:
             self._tools.clear()
+            self._publish()
     
     def size(self) -> int:
         """Get the number of registered tools.
@@ -109,8 +116,7 @@ class ToolRegistry:
         Returns:
             Number of registered tools
         """
-        with self._lock:
-            return len(self._tools)
+        return len(self._snapshot)
     
     def has_tool(self, name: str) -> bool:
         """Check if a tool is registered.
@@ -121,8 +127,7 @@ class ToolRegistry:
         Returns:
             True if tool is registered, False otherwise
         """
-        with self._lock:
-            return name in self._tools
+        return name in self._snapshot
     
     def update_tool(self, fn: 'Fn') -> None:
         """Update an existing tool registration.
@@ -142,6 +147,7 @@ class ToolRegistry:
             
             # Update tool
             self._tools[fn.name] = fn
+            self._publish()
     
     def get_stats(self) -> Dict[str, any]:
         """Get registry statistics.
@@ -149,10 +155,9 @@ class ToolRegistry:
         Returns:
             Dictionary with registry statistics
         """
-        with self._lock:
-            return {
-                "total_tools": len(self._tools)
-            }
+        return {
+            "total_tools": len(self._snapshot)
+        }
 
 
 # Global registry instance
@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Ensure we import the local version of the HelpingAI package for tests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from HelpingAI.client.main import HAI
+from HelpingAI.base_models import ChatCompletionMessage, ToolCall, ToolFunction
+
+
+def _tool_call():
+    return ToolCall(id="call_1", type="function", function=ToolFunction(name="f", arguments="{}"))
+
+
+def _convert(messages):
+    return HAI(api_key="testkey").chat.completions._convert_messages_to_dicts(messages)
+
+
+def test_plain_dict_messages_are_preserved():
+    messages = [{"role": "system", "content": "Be brief"}, {"role": "user", "content": "Hi"}]
+    assert _convert(messages) == messages
+
+
+def test_base_model_messages_are_converted():
+    message = ChatCompletionMessage(role="assistant", content="Hello")
+    assert _convert([message]) == [{"role": "assistant", "content": "Hello"}]
+
+
+def test_tool_calls_inside_dict_messages_are_converted_without_mutating_input():
+    message = {"role": "assistant", "content": None, "tool_calls": [_tool_call()]}
+    converted = _convert([message])[0]
+    assert converted["tool_calls"] == [
+        {"id": "call_1", "type": "function", "function": {"name": "f", "arguments": "{}"}}
+    ]
+    assert isinstance(message["tool_calls"][0], ToolCall)
+
+
+def test_unsupported_message_type_raises_value_error():
+    with pytest.raises(ValueError):
+        _convert([42])
+
+
+def test_create_assistant_message_serializes_tool_calls():
+    completions = HAI(api_key="testkey").chat.completions
+    message = completions.create_assistant_message(content=None, tool_calls=[_tool_call()])
+    assert _convert([message])[0]["tool_calls"][0]["function"]["name"] == "f"
+
+
+def test_create_assistant_message_serializes_foreign_tool_call_objects():
+    class ForeignToolCall:
+        def __init__(self):
+            self._lock = threading.Lock()  # uncopyable state must not be deep-copied
+
+        def to_dict(self):
+            return {"id": "call_2", "type": "function", "function": {"name": "g", "arguments": "{}"}}
+
+    completions = HAI(api_key="testkey").chat.completions
+    message = completions.create_assistant_message(content=None, tool_calls=[ForeignToolCall()])
+    assert _convert([message])[0]["tool_calls"] == [ForeignToolCall().to_dict()]
+
+
+def test_client_methods_can_be_patched_per_instance():
+    from unittest import mock
+
+    client = HAI(api_key="testkey")
+    with mock.patch.object(client.chat.completions, "create", return_value="patched"):
+        assert client.chat.completions.create(model="m", messages=[]) == "patched"
+    with mock.patch.object(client, "_request", return_value={}):
+        assert client._request("GET", "/models") == {}
@@ -0,0 +1,155 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Ensure we import the local version of the HelpingAI package for tests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from HelpingAI.client.main import HAI
+from HelpingAI.error import (
+    APIError,
+    ContentFilterError,
+    InvalidAPIKeyError,
+    InvalidModelError,
+    InvalidRequestError,
+    ServerError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
+)
+
+
+class DummyHTTPResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.reason = "Reason"
+        self.headers = {}
+        self.content = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.text = self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class DummySession:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def request(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.response
+
+
+def _client_returning(status_code, body=None):
+    client = HAI(api_key="testkey")
+    client.session = DummySession(DummyHTTPResponse(status_code, body))
+    return client
+
+
+def test_success_returns_parsed_json_and_sends_serialized_body():
+    client = _client_returning(200, {"ok": True})
+    assert client._request("POST", "/chat/completions", json_data={"model": "m"}) == {"ok": True}
+    assert json.loads(client.session.calls[0]["data"]) == {"model": "m"}
+
+
+@pytest.mark.parametrize("status_code, body, error_cls", [
+    (401, {"error": "bad key"}, InvalidAPIKeyError),
+    (400, {"error": {"message": "Invalid model: foo"}}, InvalidModelError),
+    (400, {"error": {"message": "messages must not be empty"}}, InvalidRequestError),
+    (429, {"error": "slow down"}, TooManyRequestsError),
+    (503, None, ServiceUnavailableError),
+    (500, {"message": "boom"}, ServerError),
+    (403, {"error": {"message": "content policy", "type": "content_filter"}}, ContentFilterError),
+    (404, {"detail": "missing"}, APIError),
+])
+def test_error_statuses_map_to_exceptions(status_code, body, error_cls):
+    client = _client_returning(status_code, body)
+    with pytest.raises(error_cls) as exc_info:
+        client._request("POST", "/chat/completions", json_data={"model": "m"})
+    assert exc_info.value.status_code == status_code
+
+
+def test_invalid_model_error_names_extracted_model():
+    client = _client_returning(400, {"error": {"message": "Invalid model: foo-preview"}})
+    with pytest.raises(InvalidModelError) as exc_info:
+        client._request("POST", "/chat/completions", json_data={"model": "foo-preview"})
+    assert "foo-preview" in str(exc_info.value)
+
+
+def test_clients_share_default_session_but_send_own_credentials():
+    first = HAI(api_key="key-one")
+    second = HAI(api_key="key-two", organization="org")
+    assert first.session is second.session
+    assert "Authorization" not in first.session.headers
+
+    first.session = DummySession(DummyHTTPResponse(200, {}))
+    second.session = DummySession(DummyHTTPResponse(200, {}))
+    first._request("GET", "/models")
+    second._request("GET", "/models", auth_required=False)
+    assert first.session.calls[0]["headers"]["Authorization"] == "Bearer key-one"
+    assert "Authorization" not in second.session.calls[0]["headers"]
+    assert second.session.calls[0]["headers"]["HAI-Organization"] == "org"
+
+
+def test_non_json_error_body_falls_back_to_status_and_preview():
+    client = _client_returning(404)
+    client.session.response.content = b"<html>not found</html>"
+    client.session.response.text = "<html>not found</html>"
+    with pytest.raises(APIError) as exc_info:
+        client._request("GET", "/models")
+    assert "HTTP 404" in str(exc_info.value)
+    assert "<html>not found</html>" in str(exc_info.value)
+
+
+def test_custom_pool_size_gets_its_own_session():
+    default = HAI(api_key="testkey")
+    pooled = HAI(api_key="testkey", pool_maxsize=5)
+    assert pooled.session is not default.session
+    assert pooled.session.get_adapter("https://api.helpingai.co")._pool_maxsize == 5
+
+
+def test_stream_requests_ask_for_uncompressed_events():
+    client = _client_returning(200, {})
+    client._request("POST", "/chat/completions", json_data={"model": "m"}, stream=True)
+    client._request("POST", "/chat/completions", json_data={"model": "m"})
+    stream_call, plain_call = client.session.calls
+    assert stream_call["headers"]["Accept-Encoding"] == "identity"
+    assert "Accept-Encoding" not in plain_call["headers"]
+    assert "Accept-Encoding" not in client._auth_headers
+
+
+def test_posts_are_not_retried_on_gateway_errors():
+    retry = HAI(api_key="testkey").session.get_adapter("https://api.helpingai.co").max_retries
+    assert retry.is_retry("POST", 429) and retry.is_retry("POST", 503)
+    assert not retry.is_retry("POST", 502) and not retry.is_retry("POST", 504)
+    assert retry.is_retry("GET", 502) and retry.is_retry("GET", 504)
+    assert retry.new(total=1).is_retry("POST", 502) is False
+
+
+def test_retry_after_wait_is_capped():
+    from urllib3 import HTTPResponse
+
+    retry = HAI(api_key="testkey").session.get_adapter("https://api.helpingai.co").max_retries
+    response = HTTPResponse(status=503, headers={"Retry-After": "3600"})
+    assert retry.get_retry_after(response) == 10.0
+    assert retry.get_retry_after(HTTPResponse(status=503, headers={"Retry-After": "2"})) == 2
+
+
+def test_shared_session_refuses_server_cookies():
+    import requests
+    from requests.cookies import MockRequest, create_cookie
+
+    session = HAI(api_key="testkey").session
+    request = MockRequest(requests.Request("GET", "https://api.helpingai.co/v1/models").prepare())
+    cookie = create_cookie("sid", "abc", domain="api.helpingai.co")
+    assert not session.cookies._policy.set_ok(cookie, request)
+    assert HAI(api_key="testkey", pool_maxsize=5).session.cookies._policy.set_ok(cookie, request)
+
+
+def test_retry_backoff_has_jitter_when_supported():
+    retry = HAI(api_key="testkey").session.get_adapter("https://api.helpingai.co").max_retries
+    if hasattr(retry, "backoff_jitter"):
+        assert retry.backoff_jitter > 0
+        assert retry.new(total=1).backoff_jitter == retry.backoff_jitter
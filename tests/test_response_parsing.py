@@ -0,0 +1,58 @@
+import copy
+import os
+import pickle
+import sys
+
+# Ensure we import the local version of the HelpingAI package for tests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from HelpingAI.client.main import HAI
+from HelpingAI.base_models import Choice
+
+
+def _response(n=2, **message):
+    message.setdefault("role", "assistant")
+    return {
+        "id": "resp",
+        "created": 0,
+        "model": "m",
+        "choices": [
+            {"index": i, "message": dict(message, content=f"choice {i}"), "finish_reason": "stop"}
+            for i in range(n)
+        ],
+        "usage": {"completion_tokens": 1, "prompt_tokens": 2, "total_tokens": 3},
+    }
+
+
+def _handle(data):
+    return HAI(api_key="testkey").chat.completions._handle_response(data)
+
+
+def test_choices_are_plain_list_of_parsed_choices():
+    completion = _handle(_response(n=2))
+    choices = completion.choices
+    assert type(choices) is list
+    assert all(isinstance(c, Choice) for c in choices)
+    assert [c.index for c in sorted(choices, key=lambda c: -c.index)] == [1, 0]
+    assert [c.index for c in [] + choices + choices * 2] == [0, 1] * 3
+    assert copy.deepcopy(choices) == choices
+    assert pickle.loads(pickle.dumps(completion)).choices == choices
+
+
+def test_completion_to_dict_includes_all_choices():
+    data = _response(n=2)
+    result = _handle(data).to_dict()
+    assert [c["message"]["content"] for c in result["choices"]] == ["choice 0", "choice 1"]
+    assert result["usage"]["total_tokens"] == 3
+
+
+def test_tool_calls_present_but_empty_stay_a_list():
+    completion = _handle(_response(n=1, tool_calls=[]))
+    assert completion.choices[0].message.tool_calls == []
+    assert _handle(_response(n=1)).choices[0].message.tool_calls is None
+
+
+def test_tool_calls_without_function_are_skipped():
+    tool_calls = [None, {"id": "a"}, {"id": "b", "function": {"name": "f", "arguments": "{}"}}]
+    completion = _handle(_response(n=1, tool_calls=tool_calls))
+    assert [tc.id for tc in completion.choices[0].message.tool_calls] == ["b"]
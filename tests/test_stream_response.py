@@ -0,0 +1,97 @@
+import os
+import sys
+import weakref
+
+# Ensure we import the local version of the HelpingAI package for tests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from HelpingAI.client.main import HAI
+
+
+class DummyStreamResponse:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def iter_content(self, chunk_size=None, decode_unicode=False):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _frame(content):
+    return (
+        b'data: {"id": "1", "created": 0, "model": "m", '
+        b'"choices": [{"index": 0, "delta": {"content": "' + content + b'"}}]}\n\n'
+    )
+
+
+def _contents(chunks):
+    client = HAI(api_key="testkey")
+    stream = client.chat.completions._handle_stream_response(DummyStreamResponse(chunks))
+    return [chunk.choices[0].delta.content for chunk in stream]
+
+
+def test_stream_yields_one_chunk_per_data_frame():
+    body = _frame(b"Hel") + _frame(b"lo") + b"data: [DONE]\n\n"
+    assert _contents([body]) == ["Hel", "lo"]
+
+
+def test_stream_reassembles_frames_split_across_reads():
+    body = _frame(b"Hel") + _frame(b"lo") + b"data: [DONE]\n\n"
+    pieces = [body[i:i + 7] for i in range(0, len(body), 7)]
+    assert _contents(pieces) == ["Hel", "lo"]
+
+
+def test_stream_handles_crlf_line_endings():
+    body = _frame(b"hi").replace(b"\n", b"\r\n") + b"data: [DONE]\r\n\r\n"
+    assert _contents([body]) == ["hi"]
+
+
+def test_stream_stops_at_done_sentinel():
+    body = _frame(b"a") + b"data: [DONE]\n\n" + _frame(b"b")
+    assert _contents([body]) == ["a"]
+
+
+def test_stream_skips_keepalive_comments_and_other_fields():
+    body = b": keepalive\n\nevent: message\n" + _frame(b"x") + b"data: [DONE]\n\n"
+    assert _contents([body]) == ["x"]
+
+
+class DummyUnchunkedRaw:
+    chunked = False
+
+    def __init__(self, pieces):
+        self._pieces = list(pieces)
+
+    def read1(self, amt=None, decode_content=None):
+        return self._pieces.pop(0) if self._pieces else b""
+
+
+class DummyUnchunkedResponse:
+    def __init__(self, pieces):
+        self.raw = DummyUnchunkedRaw(pieces)
+
+    def iter_content(self, chunk_size=None, decode_unicode=False):
+        raise AssertionError("unchunked bodies must be read with read1")
+
+
+def test_unchunked_stream_yields_each_frame_as_it_arrives():
+    client = HAI(api_key="testkey")
+    response = DummyUnchunkedResponse([_frame(b"a"), _frame(b"b"), b"data: [DONE]\n\n"])
+    stream = client.chat.completions._handle_stream_response(response)
+    assert next(stream).choices[0].delta.content == "a"
+    assert len(response.raw._pieces) == 2  # nothing read ahead of the first frame
+    assert [chunk.choices[0].delta.content for chunk in stream] == ["b"]
+
+
+def test_sse_lines_are_batched_per_read():
+    reads = [b"data: a\n\ndata: b\n", b"\ndata: c", b"\n"]
+    batches = list(HAI(api_key="testkey").chat.completions._iter_sse_lines(DummyStreamResponse(reads)))
+    assert batches == [[b"data: a", b"", b"data: b"], [b""], [b"data: c"]]
+
+
+
+def test_streamed_chunks_behave_the_same_on_every_python():
+    chunk = next(iter(HAI(api_key="testkey").chat.completions._handle_stream_response(
+        DummyStreamResponse([_frame(b"x")]))))
+    chunk.request_tag = "t"  # ad-hoc attributes and weak references stay supported
+    assert weakref.ref(chunk.choices[0].delta)() is chunk.choices[0].delta
@@ -0,0 +1,369 @@
+import os
+import sys
+import warnings
+from collections import OrderedDict
+
+import pytest
+
+# Ensure we import the local version of the HelpingAI package for tests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from HelpingAI.client.main import HAI
+from HelpingAI.client import completions
+
+
+def _tool(name):
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": "Dummy tool",
+            "parameters": {"type": "object", "properties": {}, "required": []}
+        }
+    }
+
+
+def _count_conversions(monkeypatch):
+    calls = []
+    original = completions.ensure_tool_call_format
+
+    def counting(tools):
+        calls.append(tools)
+        return original(tools)
+
+    monkeypatch.setattr(completions, "ensure_tool_call_format", counting)
+    return calls
+
+
+def test_converting_the_same_tools_list_twice_reuses_the_result(monkeypatch):
+    calls = _count_conversions(monkeypatch)
+    client = HAI(api_key="testkey")
+    tools = [_tool("a")]
+    first = client._convert_tools_parameter(tools)
+    assert client._convert_tools_parameter(tools) is first
+    assert len(calls) == 1
+
+
+def test_changed_tools_list_is_converted_again(monkeypatch):
+    calls = _count_conversions(monkeypatch)
+    client = HAI(api_key="testkey")
+    tools = [_tool("a")]
+    client._convert_tools_parameter(tools)
+    tools.append(_tool("b"))
+    converted = client._convert_tools_parameter(tools)
+    assert [t["function"]["name"] for t in converted] == ["a", "b"]
+    assert len(calls) == 2
+
+
+def test_fn_tools_are_converted_on_every_call(monkeypatch):
+    from HelpingAI.tools.core import Fn
+
+    calls = _count_conversions(monkeypatch)
+    client = HAI(api_key="testkey")
+    fn = Fn(name="a", description="old", parameters={})
+    tools = [fn, _tool("b")]
+    client._convert_tools_parameter(tools)
+    fn.description = "new"
+    converted = client._convert_tools_parameter(tools)
+    assert converted[0]["function"]["description"] == "new"
+    assert len(calls) == 2
+
+
+def test_mcp_config_lists_are_tracked_on_every_call(monkeypatch):
+    monkeypatch.setattr(completions, "ensure_tool_call_format", lambda tools: [])
+    client = HAI(api_key="testkey")
+    tracked = []
+    monkeypatch.setattr(HAI, "_track_mcp_config", lambda self, tools: tracked.append(tools))
+    tools = [{"mcpServers": {"a": {"command": "x", "args": []}}}]
+    client._convert_tools_parameter(tools)
+    tools[0]["mcpServers"]["b"] = {"command": "y", "args": []}
+    client._convert_tools_parameter(tools)
+    assert len(tracked) == 2
+
+
+def test_cached_conversion_still_records_tools_for_direct_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(completions, "ensure_tool_call_format", lambda tools: calls.append(tools) or [])
+    client = HAI(api_key="testkey")
+    plain = [_tool("a")]
+    servers = [{"mcpServers": {"time": {"command": "uvx", "args": ["mcp-server-time"]}}}]
+    client._convert_tools_parameter(plain)
+    client._convert_tools_parameter(servers)
+    assert client._mcp_config_sig != ()
+
+    client._convert_tools_parameter(plain)
+    assert calls == [plain, servers]
+    assert client._last_chat_tools_config is plain
+    assert client._mcp_config_sig == ()
+
+
+def test_configure_tools_drops_cached_conversion(monkeypatch):
+    calls = _count_conversions(monkeypatch)
+    client = HAI(api_key="testkey")
+    tools = [_tool("a")]
+    client._convert_tools_parameter(tools)
+    client.configure_tools(tools)
+    client._convert_tools_parameter(tools)
+    assert len(calls) == 2
+
+
+class FakeMCPTool:
+    def __init__(self, name):
+        self.name = name
+        self.description = f"MCP tool {name}"
+        self.inputSchema = {"type": "object", "properties": {}, "required": []}
+
+
+class FakeMCPClient:
+    def __init__(self, *tool_names):
+        self.tools = [FakeMCPTool(name) for name in tool_names]
+
+
+class FakeFn:
+    def __init__(self, client_id, mcp_tool_name):
+        self.client_id = client_id
+        self.mcp_tool_name = mcp_tool_name
+
+    def call(self, arguments):
+        return (self.client_id, self.mcp_tool_name, arguments)
+
+
+class FakeMCPManager:
+    def __init__(self, clients):
+        self.clients = clients
+        self.created = []
+
+    def _create_mcp_tool_fn(self, name, client_id, mcp_tool_name, description, parameters):
+        self.created.append(name)
+        return FakeFn(client_id, mcp_tool_name)
+
+
+def _client_with_mcp(clients):
+    client = HAI(api_key="testkey")
+    client._tools_config = [{"mcpServers": {}}]
+    client._mcp_manager = FakeMCPManager(clients)
+    return client
+
+
+def test_call_dispatches_mcp_tool_by_server_prefixed_name():
+    client = _client_with_mcp({
+        "time_1234": FakeMCPClient("now", "convert"),
+        "fetch_5678": FakeMCPClient("fetch"),
+    })
+    assert client.call("fetch-fetch", {"url": "x"}) == ("fetch_5678", "fetch", {"url": "x"})
+    assert client.call("time-convert", {}) == ("time_1234", "convert", {})
+
+
+def test_mcp_tool_index_picks_up_clients_added_later():
+    clients = {"time_1234": FakeMCPClient("now")}
+    client = _client_with_mcp(clients)
+    client.call("time-now", {})
+    clients["fetch_5678"] = FakeMCPClient("fetch")
+    assert client.call("fetch-fetch", {}) == ("fetch_5678", "fetch", {})
+
+
+def test_mcp_tool_index_is_rebuilt_for_a_replacement_manager():
+    client = _client_with_mcp({"time_1111": FakeMCPClient("now")})
+    assert client.call("time-now", {})[0] == "time_1111"
+    client._mcp_manager = FakeMCPManager({"time_2222": FakeMCPClient("now")})
+    client._dispatch_cache.clear()
+    assert client.call("time-now", {})[0] == "time_2222"
+
+
+def test_mcp_tool_fn_is_built_once_per_tool():
+    client = _client_with_mcp({"time_1234": FakeMCPClient("now")})
+    client.call("time-now", {})
+    client.call("time-now", {})
+    assert client._mcp_manager.created == ["time-now"]
+
+    client.configure_tools([{"mcpServers": {}}])
+    client._mcp_manager = FakeMCPManager({"time_1234": FakeMCPClient("now")})
+    client.call("time-now", {})
+    assert client._mcp_manager.created == ["time-now"]
+
+
+def test_builtin_tool_fn_is_reused_across_calls():
+    client = HAI(api_key="testkey")
+    assert client.call("code_interpreter", {"code": ""}) == "No code provided to execute."
+    handler = client._dispatch_cache["code_interpreter"]
+    client.call("code_interpreter", {"code": ""})
+    assert client._dispatch_cache["code_interpreter"] is handler
+
+
+def test_registry_tools_take_priority_over_cached_dispatch():
+    from HelpingAI.tools import get_registry
+    from HelpingAI.tools.core import Fn
+
+    client = HAI(api_key="testkey")
+    client.call("code_interpreter", {"code": ""})
+    registry = get_registry()
+    registry.register(Fn(
+        name="code_interpreter",
+        description="Override",
+        parameters={"type": "object", "properties": {}, "required": []},
+        function=lambda **kwargs: "registered",
+    ))
+    try:
+        assert client.call("code_interpreter", {}) == "registered"
+    finally:
+        registry.unregister("code_interpreter")
+
+
+def test_reconfiguring_same_mcp_servers_keeps_manager():
+    servers = {"mcpServers": {"time": {"command": "uvx", "args": ["mcp-server-time"]}}}
+    client = HAI(api_key="testkey")
+    client.configure_tools([servers])
+    manager = client._mcp_manager = FakeMCPManager({})
+    client.configure_tools([dict(servers), "web_search"])
+    assert client._mcp_manager is manager
+
+    client.configure_tools([{"mcpServers": {"time": {"command": "uvx", "args": ["other"]}}}])
+    assert client._mcp_manager is None
+
+
+def test_shutdown_releases_mcp_manager():
+    class ShutdownManager(FakeMCPManager):
+        stopped = False
+
+        def shutdown(self):
+            self.stopped = True
+
+    client = _client_with_mcp({"time_1234": FakeMCPClient("now")})
+    manager = client._mcp_manager = ShutdownManager({"time_1234": FakeMCPClient("now")})
+    client.call("time-now", {})
+    client.shutdown()
+    assert manager.stopped
+    assert client._mcp_manager is None
+    assert client._dispatch_cache == {}
+
+
+@pytest.mark.filterwarnings("ignore:Detected set argument")
+@pytest.mark.parametrize("arguments, expected", [
+    (None, {}),
+    ({"a": 1}, {"a": 1}),
+    ('{"a": 1}', {"a": 1}),
+    (' {"a": 1}\n', {"a": 1}),
+    ("", {}),
+    ("{}", {}),
+    ({'{"a": 1}'}, {"a": 1}),
+    (OrderedDict(a=1), {"a": 1}),
+])
+def test_process_arguments_accepts_supported_types(arguments, expected):
+    assert HAI(api_key="testkey")._process_arguments(arguments, "tool") == expected
+
+
+@pytest.mark.parametrize("arguments", ['[1, 2]', "not json", {"a", "b"}, 42])
+def test_process_arguments_rejects_invalid_input(arguments):
+    with pytest.raises(ValueError):
+        HAI(api_key="testkey")._process_arguments(arguments, "tool")
+
+
+def test_mcp_configs_are_rescanned_when_tools_list_changes():
+    client = HAI(api_key="testkey")
+    servers = {"mcpServers": {"time": {"command": "uvx", "args": ["mcp-server-time"]}}}
+    tools = ["web_search", servers]
+    assert client._find_mcp_configs(tools) == [servers]
+    assert client._find_mcp_configs(tools) is client._find_mcp_configs(tools)
+    tools.pop()
+    assert client._find_mcp_configs(tools) == []
+    assert client._find_mcp_configs("web_search") == []
+
+
+def test_unknown_tool_without_configuration_explains_setup():
+    with pytest.raises(ValueError) as exc_info:
+        HAI(api_key="testkey").call("missing_tool", {})
+    message = str(exc_info.value)
+    assert message.startswith("Tool 'missing_tool' not found. No tools are currently configured.\n\n")
+    assert "client.configure_tools([...])" in message
+
+
+def test_unknown_mcp_style_tool_with_configuration_mentions_servers():
+    client = HAI(api_key="testkey")
+    client._tools_config = ["web_search"]
+    with pytest.raises(ValueError) as exc_info:
+        client.call("time-now", {})
+    assert "appears to be an MCP tool but MCP servers may not be properly initialized" in str(exc_info.value)
+    assert "\n" not in str(exc_info.value)
+
+
+def test_set_argument_warning_is_emitted_once_per_tool():
+    client = HAI(api_key="testkey")
+    with pytest.warns(UserWarning, match="Detected set argument for 'set_args_tool'"):
+        assert client._process_arguments({'{"a": 1}'}, "set_args_tool") == {"a": 1}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert client._process_arguments({'{"a": 2}'}, "set_args_tool") == {"a": 2}
+
+
+def test_clients_with_same_mcp_servers_initialize_them_once(monkeypatch):
+    from HelpingAI.client import main
+
+    class FakeSharedManager:
+        instance = None
+
+        def __new__(cls):
+            if cls.instance is None:
+                cls.instance = super().__new__(cls)
+                cls.instance.clients = {}
+                cls.instance.inits = []
+            return cls.instance
+
+        def init_config(self, config):
+            self.inits.append(config)
+            self.clients[f"time_{len(self.inits)}"] = FakeMCPClient("now")
+
+    monkeypatch.setattr(main, "MCPManager", FakeSharedManager)
+    servers = {"mcpServers": {"time": {"command": "uvx", "args": ["mcp-server-time"]}}}
+    first = HAI(api_key="key-one")
+    second = HAI(api_key="key-two")
+    assert first._get_mcp_manager_for_tools([servers]) is second._get_mcp_manager_for_tools([dict(servers)])
+    assert FakeSharedManager.instance.inits == [servers]
+
+
+def test_tool_format_reflects_edits_to_registered_tools():
+    from HelpingAI.tools.core import Fn
+    from HelpingAI.tools.registry import ToolRegistry
+
+    registry = ToolRegistry()
+    fn = Fn(name="a", description="A", parameters={})
+    registry.register(fn)
+    registry.to_tool_format()[0]["function"]["name"] = "x"
+    fn.description = "new"
+    assert registry.to_tool_format()[0]["function"] == {"name": "a", "description": "new", "parameters": {}}
+
+
+def test_registry_reads_do_not_wait_for_writers():
+    from HelpingAI.tools.core import Fn
+    from HelpingAI.tools.registry import ToolRegistry
+
+    registry = ToolRegistry()
+    fn = Fn(name="a", description="A", parameters={})
+    registry.register(fn)
+    with registry._lock:
+        assert registry.get_tool("a") is fn
+        assert registry.has_tool("a") and registry.size() == 1
+        assert registry.get_tools(["a", "missing"]) == [fn]
+
+
+def test_other_clients_drop_a_manager_shut_down_elsewhere():
+    from HelpingAI.tools.mcp_manager import MCPManager
+
+    previous = MCPManager._instance
+    MCPManager._instance = None
+    try:
+        manager = MCPManager.__new__(MCPManager)  # the shared instance, without starting mcp
+        manager.clients = {"time_1234": FakeMCPClient("now")}
+        manager._create_mcp_tool_fn = FakeMCPManager._create_mcp_tool_fn.__get__(manager)
+        manager.created = []
+        client = HAI(api_key="testkey")
+        client._tools_config = [{"mcpServers": {}}]
+        client._mcp_manager = manager
+        client.call("time-now", {})
+        assert "time-now" in client._dispatch_cache
+
+        MCPManager._instance = None  # what MCPManager.shutdown() does
+        client._drop_stopped_mcp_manager()
+        assert client._mcp_manager is None
+        assert client._dispatch_cache == {}
+    finally:
+        MCPManager._instance = previous